@@ -1,16 +1,19 @@
+import copy
+import functools
+import locale
+import mmap
 import os
-from typing import Any, Dict, Tuple
+import stat
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
 
-import toml
-import yaml
-from deepmerge import always_merger
 from pydantic_settings import BaseSettings
 from pydantic_settings.sources import (
     PydanticBaseSettingsSource,
 )
 
-from pydantic_settings_sources.errors import ConfigFileParsingError, MissingEnvVarError
-from pydantic_settings_sources.utils import deep_substitute_env_vars
+from pydantic_settings_sources.errors import ConfigFileParsingError
+from pydantic_settings_sources.utils import deep_merge, deep_substitute_env_vars
 
 __all__ = [
     "TomlEnvConfigSettingsSource",
@@ -19,83 +22,230 @@ __all__ = [
     "TomlEnvSettings",
 ]
 
+_TOML_SUFFIXES = (".toml",)
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+# These sources provide the whole config in ``__call__``, never a per-field value.
+_EMPTY_FIELD = (None, None, False)
+
+# Parsed files are cached by path, inode, modification and change times and size so that
+# repeated instantiation only costs an ``os.stat`` per file while edits are still picked up.
+# The inode and ctime catch files replaced by one with the same size and a preserved mtime
+# (as ``cp -p``, ``rsync -a`` or extracting an archive do), since ctime cannot be set by users.
+# Neither libyaml's parser nor tomllib can be reset onto a new input, so this cache
+# (rather than reusing one parser across files) is what amortises parser setup.
+_PARSE_CACHE_SIZE = 256
+
+# Files larger than this are decoded straight from a memory map rather than being
+# read into an intermediate bytes object first.
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _import_tomllib():
+    # Parsers are imported on first use so that importing this package, or only using one of
+    # the formats, does not pay for the other parser.
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+    return tomllib
+
+
+def _import_yaml():
+    import yaml
+
+    return yaml
+
+
+def _read_text(file_path: str, encoding: str, size: int) -> str:
+    with open(file_path, "rb") as f:
+        if size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, encoding)
+        return f.read().decode(encoding)
+
+
+def _intern_keys(value: Any) -> Any:
+    """
+    Recursively rebuilds dictionaries with interned string keys.
+
+    Keys repeated across files then share one string object, which keeps merged configs small
+    and lets dict lookups short-circuit on identity.
+    """
+    if isinstance(value, dict):
+        return {
+            (sys.intern(k) if isinstance(k, str) else k): _intern_keys(v) for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_intern_keys(v) for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_toml_file(
+    file_path: str, ino: int, mtime_ns: int, ctime_ns: int, size: int
+) -> Dict[str, Any]:
+    tomllib = _import_tomllib()
+    return _intern_keys(tomllib.loads(_read_text(file_path, "utf-8", size)))
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_yaml_file(
+    file_path: str, encoding: str, ino: int, mtime_ns: int, ctime_ns: int, size: int
+) -> Any:
+    # Like ``open``, fall back to the locale encoding when none is configured.
+    data = _read_text(file_path, encoding or locale.getpreferredencoding(False), size)
+    yaml = _import_yaml()
+    # Prefer the libyaml-backed loader; PyYAML may be built without it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return _intern_keys(yaml.load(data, Loader=loader) or {})
+
+
+def _iter_config_files(root: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Yields the paths of files under ``root`` ending with one of ``suffixes``.
+
+    Directories are visited top-down like ``os.walk`` (without following symlinked directories),
+    with files yielded in name order within each directory.
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        files = []
+        subdirs = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    files.append(entry.path)
+        files.sort()
+        yield from files
+        subdirs.sort(reverse=True)
+        stack.extend(subdirs)
+
 
 class TomlEnvConfigSettingsSource(PydanticBaseSettingsSource):
     """
     A settings source that reads from a TOML file and supports environment variable overrides.
+
+    The config is loaded on the first call and reused by later calls on the same instance, so
+    ``toml_file`` should not be changed after construction.
     """
 
     def __init__(self, settings_cls, toml_file, toml_file_encoding):
         super().__init__(settings_cls)
         self.toml_file = toml_file
         self.toml_file_encoding = toml_file_encoding
+        self._config: Optional[Dict[str, Any]] = None
 
-    def _load_toml_file(self, file_path):
+    def _load_toml_file(self, file_path, st: Optional[os.stat_result] = None):
+        # TOML documents are always UTF-8, so ``toml_file_encoding`` is not used for parsing.
+        tomllib = _import_tomllib()
         try:
-            with open(file_path, encoding=self.toml_file_encoding) as f:
-                return toml.load(f) or {}
-        except Exception as e:
+            if st is None:
+                st = os.stat(file_path)
+            config = _parse_toml_file(
+                os.path.abspath(file_path), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size
+            )
+            # The cached tree is shared, so callers get a copy they are free to merge into.
+            return copy.deepcopy(config)
+        # RecursionError covers documents nested too deeply to parse or copy.
+        except (OSError, UnicodeDecodeError, RecursionError, tomllib.TOMLDecodeError) as e:
             raise ConfigFileParsingError(file_path, e) from e
 
     def get_field_value(self, field, field_name):
-        return None, None, False
+        return _EMPTY_FIELD
 
     def __call__(self) -> Dict[str, Any]:
-        config = {}
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+
+    def _load_config(self) -> Dict[str, Any]:
         try:
-            if os.path.isdir(self.toml_file):
-                for root, _, files in os.walk(self.toml_file):
-                    for file in sorted(files):
-                        if file.endswith(".toml"):
-                            file_path = os.path.join(root, file)
-                            always_merger.merge(config, self._load_toml_file(file_path))
-            elif os.path.isfile(self.toml_file):
-                config = self._load_toml_file(self.toml_file)
+            st = os.stat(self.toml_file)
+        except OSError:
+            return {}
 
-            return deep_substitute_env_vars(config)
-        except MissingEnvVarError as e:
-            raise ConfigFileParsingError(self.toml_file, e) from e
+        config = {}
+        if stat.S_ISDIR(st.st_mode):
+            for file_path in _iter_config_files(self.toml_file, _TOML_SUFFIXES):
+                deep_merge(config, self._load_toml_file(file_path))
+        elif stat.S_ISREG(st.st_mode):
+            config = self._load_toml_file(self.toml_file, st)
+
+        return deep_substitute_env_vars(config)
 
 
 class YamlEnvConfigSettingsSource(PydanticBaseSettingsSource):
     """
     A settings source that reads from a YAML file and supports environment variable overrides.
+
+    The config is loaded on the first call and reused by later calls on the same instance, so
+    ``yaml_file`` should not be changed after construction.
     """
 
     def __init__(self, settings_cls, yaml_file, yaml_file_encoding):
         super().__init__(settings_cls)
         self.yaml_file = yaml_file
         self.yaml_file_encoding = yaml_file_encoding
+        self._config: Optional[Dict[str, Any]] = None
 
-    def _load_yaml_file(self, file_path):
+    def _load_yaml_file(self, file_path, st: Optional[os.stat_result] = None):
+        yaml = _import_yaml()
         try:
-            with open(file_path, encoding=self.yaml_file_encoding) as f:
-                return yaml.safe_load(f) or {}
-        except MissingEnvVarError as e:
-            raise e
-        except Exception as e:
+            if st is None:
+                st = os.stat(file_path)
+            config = _parse_yaml_file(
+                os.path.abspath(file_path),
+                self.yaml_file_encoding,
+                st.st_ino,
+                st.st_mtime_ns,
+                st.st_ctime_ns,
+                st.st_size,
+            )
+            # The cached tree is shared, so callers get a copy they are free to merge into.
+            return copy.deepcopy(config)
+        # ValueError also covers decoding errors and out-of-range timestamps, LookupError an
+        # unknown ``yaml_file_encoding`` and RecursionError documents nested too deeply (or
+        # recursive through aliases) to walk.
+        except (OSError, LookupError, RecursionError, ValueError, yaml.YAMLError) as e:
             raise ConfigFileParsingError(file_path, e) from e
 
     def get_field_value(self, field, field_name):
-        return None, None, False
+        return _EMPTY_FIELD
 
     def __call__(self) -> Dict[str, Any]:
-        config = {}
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+
+    def _load_config(self) -> Dict[str, Any]:
         try:
-            if os.path.isdir(self.yaml_file):
-                for root, _, files in os.walk(self.yaml_file):
-                    for file in sorted(files):
-                        if file.endswith((".yaml", ".yml")):
-                            file_path = os.path.join(root, file)
-                            always_merger.merge(config, self._load_yaml_file(file_path))
-            elif os.path.isfile(self.yaml_file):
-                config = self._load_yaml_file(self.yaml_file)
-
-            return deep_substitute_env_vars(config)
-        except MissingEnvVarError as e:
-            raise e
-        except ConfigFileParsingError as e:
-            raise e
+            st = os.stat(self.yaml_file)
+        except OSError:
+            return {}
+
+        config = {}
+        if stat.S_ISDIR(st.st_mode):
+            for file_path in _iter_config_files(self.yaml_file, _YAML_SUFFIXES):
+                file_config = self._load_yaml_file(file_path)
+                # Only mappings can be merged; a top-level list or scalar is not a config.
+                if not isinstance(file_config, dict):
+                    raise ConfigFileParsingError(
+                        file_path,
+                        TypeError(f"expected a mapping, got {type(file_config).__name__}"),
+                    )
+                deep_merge(config, file_config)
+        elif stat.S_ISREG(st.st_mode):
+            config = self._load_yaml_file(self.yaml_file, st)
+
+        return deep_substitute_env_vars(config)
 
 
 class YamlEnvSettings(BaseSettings):
@@ -156,7 +306,7 @@ class TomlEnvSettings(BaseSettings):
 
     Configure using model_config:
         - toml_file: Path to TOML file or directory (required)
-        - toml_file_encoding: File encoding (default: "utf-8")
+        - toml_file_encoding: Accepted for compatibility; TOML files are always read as UTF-8
         - extra: "allow" to accept extra fields from TOML
         - case_sensitive: False for case-insensitive field matching
 
@@ -1,42 +1,94 @@
 import json
 import os
 import re
-from typing import Any
+from typing import Any, Dict, Iterator, Tuple
 
 from pydantic_settings_sources.errors import MissingEnvVarError
 
 env_var_regex = re.compile(r"\$\{([^:}]+)(?::-([^}]+))?\}")
+_subn_env_vars = env_var_regex.subn
 
+# Characters a JSON document can start with (including the NaN/Infinity extensions of ``json``).
+# Strings starting with anything else are returned as-is without raising a decode error.
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI \t\n\r')
 
-def _substitute_env_var(match: re.Match) -> str:
-    var_name = match.group(1)
-    default_value = match.group(2)
 
-    env_value = os.environ.get(var_name)
-    if env_value is not None:
-        return env_value
+def _substitute_env_var(match: re.Match) -> str:
+    var_name, default_value = match.groups()
 
-    if default_value is not None:
-        return default_value
+    try:
+        return os.environ[var_name]
+    except KeyError:
+        if default_value is not None:
+            return default_value
 
     raise MissingEnvVarError(var_name)
 
 
+def _substitute_string(value: str) -> Any:
+    # Substituted values may themselves contain references, so repeat until none are left.
+    if "$" in value:
+        value, count = _subn_env_vars(_substitute_env_var, value)
+        while count:
+            value, count = _subn_env_vars(_substitute_env_var, value)
+
+    if not value or value[0] not in _JSON_START_CHARS:
+        return value
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+def _iter_items(node: Any) -> Iterator[Tuple[Any, Any]]:
+    return iter(node.items()) if isinstance(node, dict) else enumerate(node)
+
+
 def deep_substitute_env_vars(value: Any) -> Any:
     """
-    Recursively substitutes environment variables in a dictionary, list, or string.
+    Substitutes environment variables in a dictionary, list, or string.
+
+    Dictionaries and lists are updated in place and returned; nested containers are walked in
+    document order with an explicit stack rather than recursion, so the first missing variable
+    in the file is the one reported. Substitution runs on the parsed tree rather than the
+    raw file so that values are never re-interpreted as YAML or TOML syntax.
     """
-    if isinstance(value, dict):
-        return {k: deep_substitute_env_vars(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [deep_substitute_env_vars(v) for v in value]
-    if not isinstance(value, str):
+    if isinstance(value, str):
+        return _substitute_string(value)
+    if not isinstance(value, (dict, list)):
         return value
 
-    while env_var_regex.search(value):
-        value = env_var_regex.sub(_substitute_env_var, value)
+    # Each entry holds a container and an iterator over its remaining items, so a nested
+    # container is finished before its later siblings, as a recursive walk would.
+    stack = [(value, _iter_items(value))]
+    while stack:
+        node, items = stack[-1]
+        for key, item in items:
+            if isinstance(item, str):
+                node[key] = _substitute_string(item)
+            elif isinstance(item, (dict, list)):
+                stack.append((item, _iter_items(item)))
+                break
+        else:
+            stack.pop()
+    return value
 
-    try:
-        return json.loads(value)
-    except (json.JSONDecodeError, TypeError):
-        return value
+
+def deep_merge(base: Dict[Any, Any], other: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    Recursively merges ``other`` into ``base`` in place and returns ``base``.
+
+    Nested dictionaries are merged, lists are concatenated, sets are unioned and any other value
+    from ``other`` replaces the one in ``base``.
+    """
+    for key, value in other.items():
+        current = base.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            deep_merge(current, value)
+        elif isinstance(value, list) and isinstance(current, list):
+            base[key] = current + value
+        elif isinstance(value, set) and isinstance(current, set):
+            base[key] = current | value
+        else:
+            base[key] = value
+    return base
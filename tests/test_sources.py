@@ -1,6 +1,9 @@
+import contextlib
+import functools
 import json
+import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, ClassVar, Dict, List
 
 import pytest
 from pydantic import BaseModel
@@ -11,6 +14,7 @@ from pydantic_settings_sources import (
     TomlEnvSettings,
     YamlEnvConfigSettingsSource,
     YamlEnvSettings,
+    sources,
 )
 from pydantic_settings_sources.errors import ConfigFileParsingError, MissingEnvVarError
 
@@ -31,49 +35,18 @@ class ConfigModel(BaseSettings):
     nested_dict_value: Dict[str, Dict[str, Dict[str, str]]]
 
 
-@pytest.fixture
-def config_path(request, tmp_path):
-    config_file = request.param
-    config_content = Path(f"tests/data/{config_file}").read_text()
-    config_path = tmp_path / config_file
-    config_path.write_text(config_content)
-    return config_path
-
-
-@pytest.fixture
-def source_kwargs(request, config_path):
-    if request.param == YamlEnvConfigSettingsSource:
-        return {"yaml_file": config_path, "yaml_file_encoding": "utf-8"}
-    elif request.param == TomlEnvConfigSettingsSource:
-        return {"toml_file": config_path, "toml_file_encoding": "utf-8"}
-    return {}
-
+@functools.lru_cache(maxsize=None)
+def _settings_cls(source_class):
+    """
+    Builds a ``ConfigModel`` subclass reading from ``source_class``, once per source class.
 
-@pytest.mark.parametrize(
-    "config_path, source_class, source_kwargs",
-    [
-        ("config.yaml", YamlEnvConfigSettingsSource, YamlEnvConfigSettingsSource),
-        ("config.toml", TomlEnvConfigSettingsSource, TomlEnvConfigSettingsSource),
-    ],
-    indirect=["config_path", "source_kwargs"],
-)
-def test_source_default_values(config_path, source_class, source_kwargs, monkeypatch):
-    monkeypatch.setenv("STRING_VALUE", "default_string")
-    monkeypatch.setenv("INTEGER_VALUE", "123")
-    monkeypatch.setenv("FLOAT_VALUE", "123.45")
-    monkeypatch.setenv("BOOLEAN_VALUE", "true")
-    monkeypatch.setenv("LIST_VALUE", json.dumps(["a", "b", "c"]))
-    monkeypatch.setenv("DICT_VALUE", json.dumps({"key1": "value1", "key2": "value2"}))
-    monkeypatch.setenv(
-        "LIST_OF_DICTS_VALUE",
-        json.dumps([{"key1": "value1", "key2": "value2"}, {"key1": "value3", "key2": "value4"}]),
-    )
-    monkeypatch.setenv(
-        "NESTED_DICT_VALUE",
-        json.dumps({"level1": {"level2": {"key1": "value1", "key2": "value2"}}}),
-    )
+    Tests point it at their files by patching ``source_kwargs`` rather than defining a new class,
+    so pydantic only builds the model schema once.
+    """
 
     class Settings(ConfigModel):
+        source_kwargs: ClassVar[Dict[str, Any]] = {}
+
         @classmethod
         def settings_customise_sources(
             cls,
@@ -85,161 +58,253 @@ def test_source_default_values(config_path, source_class, source_kwargs, monkeyp
         ):
             return (
                 init_settings,
-                source_class(cls, **source_kwargs),
+                source_class(cls, **cls.source_kwargs),
                 env_settings,
                 dotenv_settings,
                 file_secret_settings,
             )
 
-    settings = Settings()
-    assert settings.string_value == "default_string"
-    assert settings.integer_value == 123
-    assert settings.float_value == 123.45
-    assert isinstance(settings.float_value, float)
-    assert settings.boolean_value is True
-    assert settings.list_value == ["a", "b", "c"]
-    assert settings.dict_value == {"key1": "value1", "key2": "value2"}
-    assert settings.list_of_dicts_value == [
-        SubConfigModel(key1="value1", key2="value2"),
-        SubConfigModel(key1="value3", key2="value4"),
-    ]
-    assert settings.nested_dict_value == {
-        "level1": {"level2": {"key1": "value1", "key2": "value2"}}
-    }
+    return Settings
+
+
+_SOURCE_CLASSES = {
+    "yaml": YamlEnvConfigSettingsSource,
+    "toml": TomlEnvConfigSettingsSource,
+}
+
+# Read the shared config files once; each test still gets its own copy in tmp_path.
+_CONFIG_BYTES = {
+    fmt: (Path(__file__).parent / "data" / f"config.{fmt}").read_bytes() for fmt in _SOURCE_CLASSES
+}
+
+
+@pytest.fixture
+def config_path(fmt, tmp_path):
+    config_path = tmp_path / f"config.{fmt}"
+    config_path.write_bytes(_CONFIG_BYTES[fmt])
+    return config_path
+
+
+_DEFAULT_ENV = {
+    "STRING_VALUE": "default_string",
+    "INTEGER_VALUE": "123",
+    "FLOAT_VALUE": "123.45",
+    "BOOLEAN_VALUE": "true",
+    "LIST_VALUE": json.dumps(["a", "b", "c"]),
+    "DICT_VALUE": json.dumps({"key1": "value1", "key2": "value2"}),
+    "LIST_OF_DICTS_VALUE": json.dumps(
+        [{"key1": "value1", "key2": "value2"}, {"key1": "value3", "key2": "value4"}]
+    ),
+    "NESTED_DICT_VALUE": json.dumps({"level1": {"level2": {"key1": "value1", "key2": "value2"}}}),
+}
+
+_OVERRIDE_ENV = {
+    "STRING_VALUE": "overridden_string",
+    "INTEGER_VALUE": "456",
+    "FLOAT_VALUE": "456.78",
+    "BOOLEAN_VALUE": "false",
+    "LIST_VALUE": json.dumps(["x", "y", "z"]),
+    "DICT_VALUE": json.dumps({"key1": "overridden_value1", "key2": "overridden_value2"}),
+    "LIST_OF_DICTS_VALUE": json.dumps(
+        [
+            {"key1": "overridden_value1", "key2": "overridden_value2"},
+            {"key1": "overridden_value3", "key2": "overridden_value4"},
+        ]
+    ),
+    "NESTED_DICT_VALUE": json.dumps(
+        {"level1": {"level2": {"key1": "overridden_value1", "key2": "overridden_value2"}}}
+    ),
+}
+
+
+_DEFAULT_EXPECTED = {
+    "string_value": "default_string",
+    "integer_value": 123,
+    "float_value": 123.45,
+    "boolean_value": True,
+    "list_value": ["a", "b", "c"],
+    "dict_value": {"key1": "value1", "key2": "value2"},
+    "list_of_dicts_value": [
+        {"key1": "value1", "key2": "value2"},
+        {"key1": "value3", "key2": "value4"},
+    ],
+    "nested_dict_value": {"level1": {"level2": {"key1": "value1", "key2": "value2"}}},
+}
+
+_OVERRIDE_EXPECTED = {
+    "string_value": "overridden_string",
+    "integer_value": 456,
+    "float_value": 456.78,
+    "boolean_value": False,
+    "list_value": ["x", "y", "z"],
+    "dict_value": {"key1": "overridden_value1", "key2": "overridden_value2"},
+    "list_of_dicts_value": [
+        {"key1": "overridden_value1", "key2": "overridden_value2"},
+        {"key1": "overridden_value3", "key2": "overridden_value4"},
+    ],
+    "nested_dict_value": {
+        "level1": {"level2": {"key1": "overridden_value1", "key2": "overridden_value2"}}
+    },
+}
+
+
+@contextlib.contextmanager
+def _patched_env(env):
+    """Sets all of ``env`` at once, restoring only those variables on exit."""
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
 
 
 @pytest.mark.parametrize(
-    "config_path, source_class, source_kwargs",
+    "env, expected",
     [
-        ("config.yaml", YamlEnvConfigSettingsSource, YamlEnvConfigSettingsSource),
-        ("config.toml", TomlEnvConfigSettingsSource, TomlEnvConfigSettingsSource),
+        pytest.param(_DEFAULT_ENV, _DEFAULT_EXPECTED, id="defaults"),
+        pytest.param(_OVERRIDE_ENV, _OVERRIDE_EXPECTED, id="overrides"),
     ],
-    indirect=["config_path", "source_kwargs"],
 )
-def test_source_env_var_override(config_path, source_class, source_kwargs, monkeypatch):
-    monkeypatch.setenv("STRING_VALUE", "overridden_string")
-    monkeypatch.setenv("INTEGER_VALUE", "456")
-    monkeypatch.setenv("FLOAT_VALUE", "456.78")
-    monkeypatch.setenv("BOOLEAN_VALUE", "false")
-    monkeypatch.setenv("LIST_VALUE", json.dumps(["x", "y", "z"]))
-    monkeypatch.setenv(
-        "DICT_VALUE",
-        json.dumps({"key1": "overridden_value1", "key2": "overridden_value2"}),
-    )
-    monkeypatch.setenv(
-        "LIST_OF_DICTS_VALUE",
-        json.dumps(
-            [
-                {"key1": "overridden_value1", "key2": "overridden_value2"},
-                {"key1": "overridden_value3", "key2": "overridden_value4"},
-            ]
-        ),
+@pytest.mark.parametrize("fmt", list(_SOURCE_CLASSES))
+def test_source_env_var_values(fmt, env, expected, config_path, monkeypatch):
+    settings_cls = _settings_cls(_SOURCE_CLASSES[fmt])
+    monkeypatch.setattr(
+        settings_cls,
+        "source_kwargs",
+        {f"{fmt}_file": config_path, f"{fmt}_file_encoding": "utf-8"},
     )
-    monkeypatch.setenv(
-        "NESTED_DICT_VALUE",
-        json.dumps(
-            {"level1": {"level2": {"key1": "overridden_value1", "key2": "overridden_value2"}}}
-        ),
-    )
-
-    class Settings(ConfigModel):
-        @classmethod
-        def settings_customise_sources(
-            cls,
-            settings_cls,
-            init_settings,
-            env_settings,
-            dotenv_settings,
-            file_secret_settings,
-        ):
-            return (
-                init_settings,
-                source_class(cls, **source_kwargs),
-                env_settings,
-                dotenv_settings,
-                file_secret_settings,
-            )
 
-    settings = Settings()
-    assert settings.string_value == "overridden_string"
-    assert settings.integer_value == 456
-    assert settings.float_value == 456.78
+    with _patched_env(env):
+        settings = settings_cls()
+    assert settings.model_dump() == expected
     assert isinstance(settings.float_value, float)
-    assert settings.boolean_value is False
-    assert settings.list_value == ["x", "y", "z"]
-    assert settings.dict_value == {
-        "key1": "overridden_value1",
-        "key2": "overridden_value2",
-    }
-    assert settings.list_of_dicts_value == [
-        SubConfigModel(key1="overridden_value1", key2="overridden_value2"),
-        SubConfigModel(key1="overridden_value3", key2="overridden_value4"),
-    ]
-    assert settings.nested_dict_value == {
-        "level1": {
-            "level2": {
-                "key1": "overridden_value1",
-                "key2": "overridden_value2",
-            }
-        }
-    }
+    assert isinstance(settings.boolean_value, bool)
+
+
+@pytest.mark.parametrize("fmt", list(_SOURCE_CLASSES))
+def test_source_reads_large_file_through_mmap(fmt, config_path, monkeypatch):
+    """Test that files above the mmap threshold are decoded from the memory map"""
+    mapped = []
+    real_mmap = sources.mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mapped.append(args)
+        return real_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(sources, "_MMAP_THRESHOLD", 16)
+    monkeypatch.setattr(sources.mmap, "mmap", recording_mmap)
+    settings_cls = _settings_cls(_SOURCE_CLASSES[fmt])
+    monkeypatch.setattr(
+        settings_cls,
+        "source_kwargs",
+        {f"{fmt}_file": config_path, f"{fmt}_file_encoding": "utf-8"},
+    )
+
+    with _patched_env(_DEFAULT_ENV):
+        settings = settings_cls()
+    assert mapped
+    assert settings.model_dump() == _DEFAULT_EXPECTED
 
 
-def test_source_invalid_file(tmp_path):
+def test_source_invalid_file(tmp_path, monkeypatch):
     config_content = "string_value: -"
     config_path = tmp_path / "config.yaml"
     config_path.write_text(config_content)
+    settings_cls = _settings_cls(YamlEnvConfigSettingsSource)
+    monkeypatch.setattr(
+        settings_cls,
+        "source_kwargs",
+        {"yaml_file": config_path, "yaml_file_encoding": "utf-8"},
+    )
     with pytest.raises(ConfigFileParsingError):
+        settings_cls()
 
-        class Settings(ConfigModel):
-            @classmethod
-            def settings_customise_sources(
-                cls,
-                settings_cls,
-                init_settings,
-                env_settings,
-                dotenv_settings,
-                file_secret_settings,
-            ):
-                return (
-                    init_settings,
-                    YamlEnvConfigSettingsSource(
-                        cls, yaml_file=config_path, yaml_file_encoding="utf-8"
-                    ),
-                    env_settings,
-                    dotenv_settings,
-                    file_secret_settings,
-                )
 
+def test_source_unknown_encoding(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("string_value: value")
+    settings_cls = _settings_cls(YamlEnvConfigSettingsSource)
+    monkeypatch.setattr(
+        settings_cls,
+        "source_kwargs",
+        {"yaml_file": config_path, "yaml_file_encoding": "utf-9"},
+    )
+    with pytest.raises(ConfigFileParsingError):
+        settings_cls()
+
+
+@pytest.mark.parametrize(
+    "fmt, config_content",
+    [
+        ("yaml", "a: " + "[" * 2000 + "]" * 2000),
+        ("yaml", "a: &x [*x]"),
+        ("toml", "a = " + "[" * 2000 + "]" * 2000),
+    ],
+    ids=["yaml", "yaml-recursive-alias", "toml"],
+)
+def test_source_too_deeply_nested_file(fmt, config_content, tmp_path):
+    config_path = tmp_path / f"config.{fmt}"
+    config_path.write_text(config_content)
+    source = _SOURCE_CLASSES[fmt](
+        ConfigModel, **{f"{fmt}_file": config_path, f"{fmt}_file_encoding": "utf-8"}
+    )
+    with pytest.raises(ConfigFileParsingError):
+        source()
+
+
+def test_toml_source_invalid_file(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("string_value = ")
+
+    class Settings(TomlEnvSettings):
+        model_config = SettingsConfigDict(toml_file=str(config_path))
+
+        string_value: str
+
+    with pytest.raises(ConfigFileParsingError):
         Settings()
 
 
-def test_missing_env_var(tmp_path):
+def test_missing_env_var(tmp_path, monkeypatch):
     config_content = "string_value: ${MISSING_VAR}"
     config_path = tmp_path / "config.yaml"
     config_path.write_text(config_content)
+    settings_cls = _settings_cls(YamlEnvConfigSettingsSource)
+    monkeypatch.setattr(
+        settings_cls,
+        "source_kwargs",
+        {"yaml_file": config_path, "yaml_file_encoding": "utf-8"},
+    )
     with pytest.raises(MissingEnvVarError):
+        settings_cls()
 
-        class Settings(ConfigModel):
-            @classmethod
-            def settings_customise_sources(
-                cls,
-                settings_cls,
-                init_settings,
-                env_settings,
-                dotenv_settings,
-                file_secret_settings,
-            ):
-                return (
-                    init_settings,
-                    YamlEnvConfigSettingsSource(
-                        cls, yaml_file=config_path, yaml_file_encoding="utf-8"
-                    ),
-                    env_settings,
-                    dotenv_settings,
-                    file_secret_settings,
-                )
 
+def test_missing_env_var_reports_first_in_document_order(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a:\n  x: ${M1}\nb:\n  y: ${M2}\nc: ${M3}\n")
+    source = YamlEnvConfigSettingsSource(
+        ConfigModel, yaml_file=config_path, yaml_file_encoding="utf-8"
+    )
+    with pytest.raises(MissingEnvVarError) as exc_info:
+        source()
+    assert exc_info.value.var_name == "M1"
+
+
+def test_toml_missing_env_var(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text('string_value = "${MISSING_VAR}"')
+
+    class Settings(TomlEnvSettings):
+        model_config = SettingsConfigDict(toml_file=str(config_path))
+
+        string_value: str
+
+    with pytest.raises(MissingEnvVarError):
         Settings()
 
 
@@ -266,8 +331,7 @@ integer_value: ${INTEGER_VALUE}
         integer_value: int
 
     settings = Settings()
-    assert settings.string_value == "test_string"
-    assert settings.integer_value == 42
+    assert settings.model_dump() == {"string_value": "test_string", "integer_value": 42}
 
 
 def test_toml_env_settings_simple(tmp_path, monkeypatch):
@@ -292,8 +356,7 @@ integer_value = "${INTEGER_VALUE}"
         integer_value: int
 
     settings = Settings()
-    assert settings.string_value == "test_string"
-    assert settings.integer_value == 42
+    assert settings.model_dump() == {"string_value": "test_string", "integer_value": 42}
 
 
 def test_yaml_env_settings_missing_file_config():
@@ -341,11 +404,12 @@ debug: ${DEBUG:-false}
         )
 
     settings = Settings()
-    assert settings.database["host"] == "localhost"  # default used
-    assert settings.database["port"] == 5432  # default used (YAML parses as int)
-    assert settings.database["name"] == "production_db"  # env var used
-    assert settings.api_key == "default_key"  # default used
-    assert not settings.debug  # default used (YAML parses as bool)
+    # Defaults are used for everything but DB_NAME (YAML parses port as int, debug as bool)
+    assert settings.model_dump() == {
+        "database": {"host": "localhost", "port": 5432, "name": "production_db"},
+        "api_key": "default_key",
+        "debug": False,
+    }
 
 
 def test_yaml_env_settings_complex_nested_structures(tmp_path, monkeypatch):
@@ -382,17 +446,21 @@ app:
         )
 
     settings = Settings()
-    assert settings.app["name"] == "myapp"
-    assert settings.app["version"] == "1.0.0"  # default
-    assert settings.app["database"]["primary"]["host"] == "db.example.com"
-    assert settings.app["database"]["primary"]["port"] == 5432  # default (YAML parses as int)
-    assert settings.app["database"]["primary"]["credentials"]["username"] == "admin"
-    assert settings.app["database"]["primary"]["credentials"]["password"] == "secret123"
-    assert settings.app["database"]["replicas"] == [
-        "replica1.example.com",
-        "replica2.example.com",
-    ]
-    assert settings.app["features"]["enabled"] == ["feature_a", "feature_b"]
+    assert settings.model_dump() == {
+        "app": {
+            "name": "myapp",
+            "version": "1.0.0",  # default
+            "database": {
+                "primary": {
+                    "host": "db.example.com",
+                    "port": 5432,  # default (YAML parses as int)
+                    "credentials": {"username": "admin", "password": "secret123"},
+                },
+                "replicas": ["replica1.example.com", "replica2.example.com"],
+            },
+            "features": {"enabled": ["feature_a", "feature_b"]},
+        }
+    }
 
 
 def test_yaml_env_settings_directory_merge(tmp_path, monkeypatch):
@@ -431,13 +499,150 @@ database:
         )
 
     settings = Settings()
-    # Check merged values
-    assert settings.app["name"] == "testapp_yaml"
-    assert settings.app["timeout"] == 30  # YAML parses as int
-    assert not settings.app["debug"]  # YAML parses as bool
-    assert settings.database["host"] == "localhost"
-    assert settings.database["port"] == 5432  # YAML parses as int
-    assert settings.database["ssl"]  # YAML parses as bool
+    # Check merged values (YAML parses ints and bools)
+    assert settings.model_dump() == {
+        "app": {"name": "testapp_yaml", "timeout": 30, "debug": False},
+        "database": {"host": "localhost", "port": 5432, "ssl": True},
+    }
+
+
+def test_yaml_env_settings_directory_merge_lists(tmp_path):
+    """Test that lists are concatenated, sets unioned and scalars overridden in a directory"""
+    config_dir = tmp_path / "yaml_config"
+    config_dir.mkdir()
+
+    (config_dir / "01_base.yaml").write_text(
+        """
+app:
+  name: base
+  plugins: [auth]
+  tags: !!set {a, b}
+"""
+    )
+    (config_dir / "02_override.yml").write_text(
+        """
+app:
+  name: override
+  plugins: [metrics]
+  tags: !!set {c}
+"""
+    )
+
+    class Settings(YamlEnvSettings):
+        model_config = SettingsConfigDict(
+            yaml_file=str(config_dir),
+            extra="allow",
+        )
+
+    settings = Settings()
+    assert settings.app == {
+        "name": "override",
+        "plugins": ["auth", "metrics"],
+        "tags": {"a", "b", "c"},
+    }
+
+
+@pytest.mark.parametrize("config_content", ["- x\n", "just a scalar\n"], ids=["list", "scalar"])
+def test_yaml_env_settings_directory_non_mapping_file(config_content, tmp_path):
+    """Test that a file in a directory whose top level is not a mapping is reported"""
+    config_dir = tmp_path / "yaml_config"
+    config_dir.mkdir()
+    (config_dir / "01_base.yaml").write_text("name: base\n")
+    (config_dir / "02_invalid.yaml").write_text(config_content)
+
+    class Settings(YamlEnvSettings):
+        model_config = SettingsConfigDict(
+            yaml_file=str(config_dir),
+            extra="allow",
+        )
+
+    with pytest.raises(ConfigFileParsingError, match="02_invalid.yaml"):
+        Settings()
+
+
+def test_yaml_env_settings_directory_merge_name_order(tmp_path, monkeypatch):
+    """Test that later file names take precedence when merging many files from a directory"""
+    config_dir = tmp_path / "yaml_config"
+    config_dir.mkdir()
+
+    for index in range(10):
+        (config_dir / f"{index:02d}.yaml").write_text(
+            f"""
+last: {index}
+file_{index}: ${{FILE_{index}:-loaded}}
+"""
+        )
+
+    monkeypatch.setenv("FILE_3", "from_env")
+
+    class Settings(YamlEnvSettings):
+        model_config = SettingsConfigDict(
+            yaml_file=str(config_dir),
+            extra="allow",
+        )
+
+    settings = Settings()
+    expected = {f"file_{index}": "loaded" for index in range(10)}
+    expected.update(last=9, file_3="from_env")
+    assert settings.model_dump() == expected
+
+
+def test_yaml_env_settings_reloads_modified_file(tmp_path):
+    """Test that cached parse results are invalidated when the file changes"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("app:\n  name: first\n")
+
+    class Settings(YamlEnvSettings):
+        model_config = SettingsConfigDict(
+            yaml_file=str(config_path),
+            extra="allow",
+        )
+
+    first = Settings()
+    first.app["name"] = "mutated"
+    assert Settings().app == {"name": "first"}
+
+    config_path.write_text("app:\n  name: second\n  debug: true\n")
+    assert Settings().app == {"name": "second", "debug": True}
+
+
+def test_yaml_env_settings_reloads_replaced_file_with_same_mtime(tmp_path):
+    """Test that a same-size replacement keeping the old mtime is not served from the cache"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a: 2\n")
+
+    class Settings(YamlEnvSettings):
+        model_config = SettingsConfigDict(
+            yaml_file=str(config_path),
+            extra="allow",
+        )
+
+    assert Settings().a == 2
+
+    # Replace the file atomically like ``cp -p`` or ``rsync -a`` would, keeping size and mtime.
+    st = config_path.stat()
+    new_path = tmp_path / "config.yaml.new"
+    new_path.write_text("a: 3\n")
+    os.utime(new_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(new_path, config_path)
+
+    assert Settings().a == 3
+
+
+def test_source_reuses_loaded_config(tmp_path, monkeypatch):
+    """Test that a source instance only loads its config once"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("name: ${APP_NAME}\n")
+
+    monkeypatch.setenv("APP_NAME", "first")
+    source = YamlEnvConfigSettingsSource(
+        ConfigModel, yaml_file=config_path, yaml_file_encoding="utf-8"
+    )
+    config = source()
+
+    monkeypatch.setenv("APP_NAME", "second")
+    assert source() is config
+    assert config == {"name": "first"}
 
 
 def test_toml_env_settings_with_defaults(tmp_path, monkeypatch):
@@ -463,11 +668,12 @@ name = "${DB_NAME}"
         )
 
     settings = Settings()
-    assert settings.database["host"] == "localhost"  # default used
-    assert settings.database["port"] == 5432  # default used (parsed from string)
-    assert settings.database["name"] == "production_db"  # env var used
-    assert settings.api_key == "default_key"  # default used
-    assert not settings.debug  # default used (parsed from string)
+    # Defaults are used for everything but DB_NAME (port and debug parsed from string)
+    assert settings.model_dump() == {
+        "database": {"host": "localhost", "port": 5432, "name": "production_db"},
+        "api_key": "default_key",
+        "debug": False,
+    }
 
 
 def test_yaml_env_settings_with_typed_fields(tmp_path, monkeypatch):
@@ -500,14 +706,16 @@ tags: ${APP_TAGS}
         tags: List[str]
 
     settings = Settings()
-    assert settings.name == "myapp"
-    assert settings.port == 8080
+    assert settings.model_dump() == {
+        "name": "myapp",
+        "port": 8080,
+        "timeout": 30.5,
+        "enabled": True,
+        "tags": ["web", "api", "v1"],
+    }
     assert isinstance(settings.port, int)
-    assert settings.timeout == 30.5
     assert isinstance(settings.timeout, float)
     assert settings.enabled is True
-    assert isinstance(settings.enabled, bool)
-    assert settings.tags == ["web", "api", "v1"]
 
 
 def test_yaml_env_settings_case_insensitive(tmp_path, monkeypatch):
@@ -536,11 +744,55 @@ debug_mode: ${DEBUG}
         debug_mode: bool
 
     settings = Settings()
-    assert settings.database_url == "postgresql://localhost/db"
-    assert settings.api_key == "secret"
+    assert settings.model_dump() == {
+        "database_url": "postgresql://localhost/db",
+        "api_key": "secret",
+        "debug_mode": True,
+    }
     assert settings.debug_mode is True  # YAML parses "true" as bool
 
 
+def test_env_var_values_are_not_parsed_as_config_syntax(tmp_path, monkeypatch):
+    """Test that substituted values containing YAML/TOML syntax are kept verbatim"""
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text("# uses ${UNSET_IN_COMMENT}\nvalue: ${RAW_VALUE}\n")
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text('value = "${RAW_VALUE}"\n')
+
+    monkeypatch.setenv("RAW_VALUE", 'key: "quoted" # not a comment')
+
+    class YamlSettings(YamlEnvSettings):
+        model_config = SettingsConfigDict(yaml_file=str(yaml_path))
+
+        value: str
+
+    class TomlSettings(TomlEnvSettings):
+        model_config = SettingsConfigDict(toml_file=str(toml_path))
+
+        value: str
+
+    assert YamlSettings().value == 'key: "quoted" # not a comment'
+    assert TomlSettings().value == 'key: "quoted" # not a comment'
+
+
+def test_env_var_json_values_are_decoded_with_json(tmp_path, monkeypatch):
+    """Test that JSON values follow ``json`` semantics for non-finite floats and big integers"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("nan: ${NAN}\ninf: ${INF}\nbig: ${BIG}\n")
+
+    monkeypatch.setenv("NAN", "NaN")
+    monkeypatch.setenv("INF", "-Infinity")
+    monkeypatch.setenv("BIG", str(2**70))
+
+    source = YamlEnvConfigSettingsSource(
+        ConfigModel, yaml_file=config_path, yaml_file_encoding="utf-8"
+    )
+    config = source()
+    assert config["nan"] != config["nan"]
+    assert config["inf"] == float("-inf")
+    assert config["big"] == 2**70
+
+
 def test_yaml_env_settings_extra_allow(tmp_path, monkeypatch):
     """Test that extra='allow' permits additional fields from YAML"""
     config_content = """
@@ -566,10 +818,12 @@ extra_field_2: ${EXTRA_2:-default_extra}
         port: int
 
     settings = Settings()
-    assert settings.name == "testapp"
-    assert settings.port == 9000
-    assert settings.extra_field_1 == "extra_value"
-    assert settings.extra_field_2 == "default_extra"
+    assert settings.model_dump() == {
+        "name": "testapp",
+        "port": 9000,
+        "extra_field_1": "extra_value",
+        "extra_field_2": "default_extra",
+    }
 
 
 def test_yaml_env_settings_mixed_sources(tmp_path, monkeypatch):
@@ -592,9 +846,8 @@ from_yaml: ${YAML_VAR}
         from_env: str = "default"
 
     settings = Settings()
-    assert settings.from_yaml == "yaml_value"
     # Environment variable should override default
-    assert settings.from_env == "env_value"
+    assert settings.model_dump() == {"from_yaml": "yaml_value", "from_env": "env_value"}
 
 
 def test_toml_directory_merge(tmp_path, monkeypatch):
@@ -635,13 +888,32 @@ ssl = "${DB_SSL:-true}"
         )
 
     settings = Settings()
-    # Check merged values
-    assert settings.app["name"] == "testapp_toml"
-    assert settings.app["timeout"] == 30  # Parsed from string
-    assert not settings.app["debug"]  # Parsed from string
-    assert settings.database["host"] == "localhost"
-    assert settings.database["port"] == 5432  # Parsed from string
-    assert settings.database["ssl"]  # Parsed from string
+    # Check merged values (ints and bools parsed from string)
+    assert settings.model_dump() == {
+        "app": {"name": "testapp_toml", "timeout": 30, "debug": False},
+        "database": {"host": "localhost", "port": 5432, "ssl": True},
+    }
+
+
+def test_toml_directory_merge_nested(tmp_path):
+    """Test that files in a directory are merged before those in its subdirectories"""
+    config_dir = tmp_path / "toml_config"
+    (config_dir / "nested").mkdir(parents=True)
+
+    (config_dir / "nested" / "00_first.toml").write_text('name = "nested"\nlevel = "nested"\n')
+    (config_dir / "02_override.toml").write_text('name = "override"\n')
+    (config_dir / "01_base.toml").write_text('name = "base"\nbase_only = true\n')
+    (config_dir / "notes.txt").write_text("not a config file")
+
+    class Settings(TomlEnvSettings):
+        model_config = SettingsConfigDict(
+            toml_file=str(config_dir),
+            extra="allow",
+        )
+
+    settings = Settings()
+    assert settings.model_dump() == {"name": "nested", "level": "nested", "base_only": True}
+    assert settings.base_only is True
 
 
 def test_yaml_env_settings_with_pydantic_models(tmp_path, monkeypatch):
@@ -679,7 +951,11 @@ database:
         database: Database
 
     settings = Settings()
-    assert settings.database.host == "db.example.com"
-    assert settings.database.port == 5432
-    assert settings.database.credentials.username == "admin"
-    assert settings.database.credentials.password == "secret"
+    assert isinstance(settings.database.credentials, Credentials)
+    assert settings.model_dump() == {
+        "database": {
+            "host": "db.example.com",
+            "port": 5432,
+            "credentials": {"username": "admin", "password": "secret"},
+        }
+    }